@@ -7,6 +7,9 @@ and ensures that signals are only generated when specific criteria are met.
 """
 
 class AlertEngine:
+    # Fixed attribute set: evaluate() runs at market-data rate, avoid per-instance __dict__
+    __slots__ = ('threshold', 'reset_threshold', 'min_correlation', 'current_state')
+
     def __init__(self, threshold=2.0, reset_threshold=0.5, min_correlation=0.7):
         """
         Initialize the Alert Engine.
@@ -39,10 +42,17 @@ class AlertEngine:
         if z_score is None or rolling_correlation is None or adf_result is None:
             return None
 
+        # Hoist attribute reads into locals for the hot path
+        thr = self.threshold
+        rthr = self.reset_threshold
+        minc = self.min_correlation
+        state = self.current_state
+
         # 1. State Reset Logic
         # We only reset state if we are currently holding a position/signal state
-        if self.current_state is not None:
-            if abs(z_score) < self.reset_threshold:
+        if state is not None:
+            # Chained compare: same as abs(z_score) < rthr without the abs() call
+            if -rthr < z_score < rthr:
                 self.current_state = None
                 # Optionally logs could go here via a logger, but requirements say no printing/side-effects.
                 # We just silently reset internal state.
@@ -55,36 +65,37 @@ class AlertEngine:
         # 2. Trigger Logic (Only if State is None)
         
         # Filter 1: Correlation
-        if rolling_correlation < self.min_correlation:
+        if rolling_correlation < minc:
             return None
             
         # Filter 2: Stationarity
-        if not adf_result.get('is_stationary', False):
+        if not adf_result['is_stationary']:
             return None
             
         # Filter 3: Z-Score Thresholds
-        signal = None
-        reason = ""
-        
-        if z_score >= self.threshold:
+        # Single magnitude test plus a sign bit instead of two signed compares.
+        # z >= 0 maps to the SHORT side, matching the original `z_score >= thr` arm;
+        # `not mag >= thr` also rejects NaN.
+        sign = 1.0 if z_score >= 0 else -1.0
+        mag = z_score * sign
+        if not mag >= thr:
+            return None
+
+        if sign > 0:
             signal = "SHORT"
-            reason = f"Z-Score ({z_score:.2f}) >= Threshold ({self.threshold}) [Overbought]"
-            
-        elif z_score <= -self.threshold:
+            reason = f"Z-Score ({z_score:.2f}) >= Threshold ({thr}) [Overbought]"
+        else:
             signal = "LONG"
-            reason = f"Z-Score ({z_score:.2f}) <= -Threshold (-{self.threshold}) [Oversold]"
-            
-        if signal:
-            # Update State
-            self.current_state = signal
-            
-            # Construct Alert
-            return {
-                "timestamp": timestamp,
-                "signal": signal,
-                "z_score": z_score,
-                "correlation": rolling_correlation,
-                "reason": reason
-            }
-            
-        return None
+            reason = f"Z-Score ({z_score:.2f}) <= -Threshold (-{thr}) [Oversold]"
+
+        # Update State
+        self.current_state = signal
+
+        # Construct Alert
+        return {
+            "timestamp": timestamp,
+            "signal": signal,
+            "z_score": z_score,
+            "correlation": rolling_correlation,
+            "reason": reason
+        }
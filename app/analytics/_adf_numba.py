@@ -0,0 +1,116 @@
+"""
+Numba ADF Kernels.
+
+JIT-compiled building blocks for the Augmented Dickey-Fuller test (constant, no trend).
+They reproduce the regression and MacKinnon p-value used by statsmodels' `adfuller`
+without the pandas/OLS call stack, which dominates runtime on short rolling windows.
+
+ADF regression:
+    dy_t = alpha * y_{t-1} + c + sum_{j=1..k} gamma_j * dy_{t-j} + e_t
+"""
+
+import math
+import numpy as np
+from numba import njit
+
+# MacKinnon (1994) asymptotic tau surface for regression='c', N=1
+# (same coefficients as statsmodels.tsa.adfvalues, already scaled)
+_TAU_MAX = 2.74
+_TAU_MIN = -18.83
+_TAU_STAR = -1.61
+_TAU_SMALLP = (2.1659, 1.4412, 3.8269e-2)
+_TAU_LARGEP = (1.7339, 9.3202e-1, -1.2745e-1, -1.0368e-2)
+
+
+@njit(cache=True, nogil=True)
+def _adf_ols(y, k, nobs):
+    """
+    Fit the ADF regression with k lagged differences on the last nobs observations.
+
+    Returns:
+        tuple: (sum of squared residuals, t-statistic of alpha)
+    """
+    n = y.shape[0]
+    p = k + 2
+    dy = y[1:] - y[:-1]
+    start = n - 1 - nobs
+
+    # Design matrix columns: [y_{t-1}, 1, dy_{t-1}, ..., dy_{t-k}]
+    X = np.empty((nobs, p))
+    z = np.empty(nobs)
+    for r in range(nobs):
+        t = start + r
+        X[r, 0] = y[t]
+        X[r, 1] = 1.0
+        for j in range(1, k + 1):
+            X[r, j + 1] = dy[t - j]
+        z[r] = dy[t]
+
+    xtx_inv = np.linalg.inv(np.dot(X.T, X))
+    beta = np.dot(xtx_inv, np.dot(X.T, z))
+    resid = z - np.dot(X, beta)
+    ssr = np.dot(resid, resid)
+    sigma2 = ssr / (nobs - p)
+
+    return ssr, beta[0] / math.sqrt(sigma2 * xtx_inv[0, 0])
+
+
+@njit(cache=True, nogil=True)
+def _adf_fixed(y, k):
+    """
+    ADF t-statistic for a fixed number of lagged differences k.
+    """
+    return _adf_ols(y, k, y.shape[0] - 1 - k)[1]
+
+
+@njit(cache=True, nogil=True)
+def _adf_aic_lag(y, maxlag):
+    """
+    Select the lag order in [0, maxlag] minimizing AIC.
+    All candidates are fit on the same sample so their AIC values are comparable.
+    """
+    nobs = y.shape[0] - 1 - maxlag
+    best_lag = 0
+    best_ic = np.inf
+    for k in range(maxlag + 1):
+        ssr = _adf_ols(y, k, nobs)[0]
+        # AIC up to an additive constant shared by all candidates
+        ic = nobs * math.log(ssr / nobs) + 2.0 * (k + 2)
+        if ic < best_ic:
+            best_ic = ic
+            best_lag = k
+    return best_lag
+
+
+@njit(cache=True, nogil=True)
+def _mackinnon_p(tau):
+    """
+    MacKinnon (1994) approximate p-value for an ADF t-statistic.
+    """
+    if tau > _TAU_MAX:
+        return 1.0
+    if tau < _TAU_MIN:
+        return 0.0
+
+    if tau <= _TAU_STAR:
+        a = _TAU_SMALLP
+        x = a[0] + tau * (a[1] + tau * a[2])
+    else:
+        b = _TAU_LARGEP
+        x = b[0] + tau * (b[1] + tau * (b[2] + tau * b[3]))
+
+    # Standard normal CDF
+    return 0.5 * math.erfc(-x / math.sqrt(2.0))
+
+
+def _warmup():
+    """
+    Compile (or load from the on-disk cache) the kernels at import time, so the
+    first ADF call does not pay the JIT cost.
+    """
+    y = np.random.default_rng(0).standard_normal(64).cumsum()
+    _adf_fixed(y, _adf_aic_lag(y, 4))
+    _mackinnon_p(0.0)
+
+
+_warmup()
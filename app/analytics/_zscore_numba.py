@@ -0,0 +1,127 @@
+"""
+Numba Z-Score Kernels.
+
+JIT-compiled single-pass rolling Z-Score using Welford running moments
+(mean and sum of squared deviations updated as samples enter and leave the window).
+"""
+
+import math
+import numpy as np
+from numba import njit
+
+# fastmath without 'nnan'/'ninf'/'reassoc' so the NaN/Inf window checks are not optimized away
+_FASTMATH = {'nsz', 'arcp', 'contract', 'afn'}
+
+
+@njit(inline='always', nogil=True, fastmath=_FASTMATH)
+def _welford_slide(xi, xprev, xo, w, k, mean, m2, run):
+    """
+    Advance the rolling window by one sample: drop xo (NaN if nothing leaves) and add xi.
+
+    State is (k, mean, m2, run): finite samples in the window, their mean, their sum of
+    squared deviations, and the length of the current run of identical values (a constant
+    window has exactly zero variance, which the running moments only reach up to roundoff).
+
+    Returns:
+        tuple: (z, k, mean, m2, run) where z is NaN unless the window is full,
+        finite and has non-zero variance.
+    """
+    if xi == xprev:
+        run += 1
+    else:
+        run = 1
+
+    # Remove the sample leaving the window
+    if math.isfinite(xo):
+        k -= 1
+        if k == 0:
+            mean = 0.0
+            m2 = 0.0
+        else:
+            delta = xo - mean
+            mean -= delta / k
+            m2 -= delta * (xo - mean)
+
+    # Add the sample entering the window
+    if math.isfinite(xi):
+        k += 1
+        delta = xi - mean
+        mean += delta / k
+        m2 += delta * (xi - mean)
+
+    var = m2 / (w - 1)
+    if k == w and run < w and var > 1e-24:
+        z = (xi - mean) / math.sqrt(var)
+    else:
+        z = np.nan
+
+    return z, k, mean, m2, run
+
+
+@njit(cache=True, nogil=True, fastmath=_FASTMATH)
+def _zscore_numba(series, w):
+    """
+    Rolling Z-Score with sample standard deviation (ddof=1).
+
+    Windows containing NaN/Inf, or with zero variance, yield NaN.
+    The first (w-1) outputs are NaN.
+    """
+    n = series.shape[0]
+    out = np.empty(n)
+    out[:min(w - 1, n)] = np.nan
+
+    k = 0
+    mean = 0.0
+    m2 = 0.0
+    run = 0
+    for i in range(n):
+        xprev = series[i - 1] if i > 0 else np.nan
+        xo = series[i - w] if i >= w else np.nan
+        z, k, mean, m2, run = _welford_slide(series[i], xprev, xo, w, k, mean, m2, run)
+        if i >= w - 1:
+            out[i] = z
+
+    return out
+
+
+@njit(cache=True, nogil=True, fastmath=_FASTMATH)
+def _z_of_spread(x, y, hr, w, out):
+    """
+    Rolling Z-Score of the spread y - hr * x, written into out.
+
+    The spread is computed on the fly inside the window update, so no
+    intermediate spread array is materialized. Same semantics as _zscore_numba.
+    """
+    n = x.shape[0]
+    out[:min(w - 1, n)] = np.nan
+
+    k = 0
+    mean = 0.0
+    m2 = 0.0
+    run = 0
+    for i in range(n):
+        si = y[i] - hr * x[i]
+        sprev = y[i - 1] - hr * x[i - 1] if i > 0 else np.nan
+        so = y[i - w] - hr * x[i - w] if i >= w else np.nan
+        z, k, mean, m2, run = _welford_slide(si, sprev, so, w, k, mean, m2, run)
+        if i >= w - 1:
+            out[i] = z
+
+    return out
+
+
+def _warmup():
+    """
+    Compile (or load from the on-disk cache) the kernels at import time, so the
+    first live tick does not pay the JIT cost. Both writeable and read-only
+    inputs are covered: ring buffer views are read-only and compile separately.
+    """
+    x = np.zeros(64)
+    ro = x.copy()
+    ro.flags.writeable = False
+    for arr in (x, ro):
+        _zscore_numba(arr, 20)
+        _z_of_spread(arr, arr, 1.0, 20, np.empty(64))
+
+
+_warmup()
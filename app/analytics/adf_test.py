@@ -5,16 +5,63 @@ This module performs the Augmented Dickey-Fuller (ADF) test to check for station
 in a time series. Stationarity is a key assumption for mean-reverting strategies.
 """
 
+import math
 import numpy as np
-import pandas as pd
-from statsmodels.tsa.stattools import adfuller
 
-def run_adf_test(series):
+from app.analytics._adf_numba import _adf_aic_lag, _adf_fixed, _mackinnon_p
+
+# Lag order is selected by AIC once, on the first window of at least ADF_LAG_WARMUP
+# points, then reused: the rolling window keeps the same shape, so re-running the
+# selection (maxlag + 1 auxiliary regressions) on every tick is wasted work.
+ADF_LAG_WARMUP = 50
+_ADF_K = None
+
+def _adf_statistic_pvalue(arr, force_autolag=False):
+    """
+    Compute the ADF statistic and p-value, preferring the JIT-compiled kernels.
+    Falls back to statsmodels if the kernel path fails (e.g. singular regression).
+    """
+    global _ADF_K
+    
+    # Schwert (1989) rule for the maximum lag, capped as statsmodels does
+    n = len(arr)
+    maxlag = min(int(math.ceil(12.0 * (n / 100.0) ** 0.25)), n // 2 - 2)
+    
+    lag = None
+    if not force_autolag and _ADF_K is not None:
+        lag = min(_ADF_K, maxlag)
+        
+    try:
+        if lag is None:
+            lag = _adf_aic_lag(arr, maxlag)
+            if not force_autolag and _ADF_K is None and n >= ADF_LAG_WARMUP:
+                _ADF_K = lag
+                
+        adf_stat = _adf_fixed(arr, lag)
+        
+        if np.isfinite(adf_stat):
+            return adf_stat, _mackinnon_p(adf_stat)
+    except Exception:
+        pass
+        
+    # Reference implementation, imported lazily (statsmodels pulls in pandas)
+    from statsmodels.tsa.stattools import adfuller
+    
+    if lag is None or force_autolag:
+        # autolag='AIC' chooses the optimal number of lags to minimize AIC
+        result = adfuller(arr, autolag='AIC')
+    else:
+        result = adfuller(arr, maxlag=lag, autolag=None, regression='c')
+    return result[0], result[1]
+
+def run_adf_test(series, force_autolag=False):
     """
     Run Augmented Dickey-Fuller test on a time series.
     
     Args:
         series (array-like): Input time series.
+        force_autolag (bool): Select the lag order by AIC on this series instead of
+            reusing the cached lag (default: False). Use for offline analysis.
         
     Returns:
         dict: {
@@ -27,12 +74,12 @@ def run_adf_test(series):
         ValueError: If input series is too short for the test.
     """
     # Clean input: remove NaNs/Infs
-    s = pd.Series(series).dropna()
-    s = s[np.isfinite(s)]
+    arr = np.asarray(series, dtype=np.float64)
+    arr = arr[np.isfinite(arr)]
     
     # ADF test requires some data length. Statsmodels usually handles small samples but
     # it's good to check. 
-    if len(s) < 10: 
+    if len(arr) < 10: 
         # Very short series might cause errors or return garbage
         return {
             "adf_statistic": np.nan,
@@ -42,11 +89,7 @@ def run_adf_test(series):
         
     try:
         # Perform ADF test
-        # autolag='AIC' chooses the optimal number of lags to minimize AIC
-        result = adfuller(s, autolag='AIC')
-        
-        adf_stat = result[0]
-        p_val = result[1]
+        adf_stat, p_val = _adf_statistic_pvalue(arr, force_autolag=force_autolag)
         
         # Determine stationarity (common threshold is 0.05)
         is_stationary = p_val < 0.05
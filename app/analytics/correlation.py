@@ -6,7 +6,15 @@ Essential for monitoring the stability of the relationship between pairs.
 """
 
 import numpy as np
-import pandas as pd
+
+def _window_sums(values, window):
+    """
+    Rolling sums over a fixed window via cumulative sums: O(n) regardless of window size.
+    """
+    cs = np.cumsum(values)
+    sums = cs[window - 1:].copy()
+    sums[1:] -= cs[:-window]
+    return sums
 
 def compute_rolling_correlation(x, y, window):
     """
@@ -26,13 +34,83 @@ def compute_rolling_correlation(x, y, window):
     if window <= 1:
         raise ValueError("Window size must be greater than 1.")
         
-    s1 = pd.Series(x)
-    s2 = pd.Series(y)
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    
+    if len(x) != len(y):
+        raise ValueError("Input series x and y must have the same length.")
+        
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+        
+    # Windows containing a NaN/Inf in either series yield NaN (same as pandas rolling)
+    valid = np.isfinite(x) & np.isfinite(y)
+    if not valid.any():
+        return out
+    
+    # Center on the global mean: correlation is shift-invariant and this keeps
+    # the running sums small enough to avoid catastrophic cancellation on prices
+    x = np.where(valid, x - x[valid].mean(), 0.0)
+    y = np.where(valid, y - y[valid].mean(), 0.0)
+    
+    # Rolling sums of x, y, x^2, y^2, xy
+    cnt = _window_sums(valid.astype(np.float64), window)
+    sx = _window_sums(x, window)
+    sy = _window_sums(y, window)
+    sxx = _window_sums(x * x, window)
+    syy = _window_sums(y * y, window)
+    sxy = _window_sums(x * y, window)
+    
+    # Closed form Pearson: (n*Sxy - Sx*Sy) / sqrt((n*Sxx - Sx^2) * (n*Syy - Sy^2))
+    var_x = window * sxx - sx * sx
+    var_y = window * syy - sy * sy
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = (window * sxy - sx * sy) / np.sqrt(var_x * var_y)
+        
+    # Mask incomplete windows and degenerate (constant) windows
+    corr[(cnt < window) | (var_x <= 0) | (var_y <= 0)] = np.nan
+    out[window - 1:] = np.clip(corr, -1.0, 1.0)
+    
+    return out
+
+def compute_correlation(x, y, min_std=1e-6):
+    """
+    Compute the Pearson correlation coefficient of two aligned windows.
+    
+    Scalar counterpart of compute_rolling_correlation for when only the latest
+    window is needed: three dot products on the mean-centered data.
+    
+    Args:
+        x (array-like): First series window.
+        y (array-like): Second series window.
+        min_std (float): Minimum (population) standard deviation of each series.
+        
+    Returns:
+        float: Correlation coefficient. Returns None if either series is (near) constant.
+        
+    Raises:
+        ValueError: If input lengths mismatch.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
     
-    if len(s1) != len(s2):
+    if len(x) != len(y):
         raise ValueError("Input series x and y must have the same length.")
         
-    # Compute rolling correlation
-    rolling_corr = s1.rolling(window=window).corr(s2)
+    n = len(x)
+    if n < 2:
+        return None
+        
+    dx = x - x.mean()
+    dy = y - y.mean()
+    sxx = np.dot(dx, dx)
+    syy = np.dot(dy, dy)
     
-    return rolling_corr.to_numpy()
+    # Same as std(x) < min_std or std(y) < min_std, without the sqrt
+    min_ss = n * min_std * min_std
+    if sxx < min_ss or syy < min_ss:
+        return None
+        
+    return float(np.dot(dx, dy) / np.sqrt(sxx * syy))
@@ -8,15 +8,17 @@ units of asset X needed to hedge one unit of asset Y.
 
 import numpy as np
 
-def compute_hedge_ratio(x, y):
+def compute_hedge_ratio(x, y, with_intercept=True):
     """
-    Compute the hedge ratio (beta) of y with respect to x using OLS without an intercept.
+    Compute the hedge ratio (beta) of y with respect to x using OLS.
     
-    Model: y = beta * x + epsilon
+    Model: y = alpha + beta * x + epsilon (alpha = 0 if with_intercept is False)
     
     Args:
         x (array-like): Independent variable (e.g., benchmark or hedge asset).
         y (array-like): Dependent variable (e.g., target asset).
+        with_intercept (bool): Fit an intercept so the spread mean can float (default: True).
+            If False, regress through the origin.
         
     Returns:
         float: The hedge ratio (beta). Returns None if input data is invalid or insufficient.
@@ -40,23 +42,16 @@ def compute_hedge_ratio(x, y):
     if not np.isfinite(x_arr).all() or not np.isfinite(y_arr).all():
         return None
         
-    # Compute OLS (No intercept as per strict hedge ratio definitions usually)
-    # Using numpy.linalg.lstsq for efficiency
-    # Reshape x to be a column vector for matrix multiplication if needed,
-    # but for 1D simple regression: slope = dot(x, y) / dot(x, x) (for zero intercept)
-    
-    # Implementing generic OLS logic
-    # beta = Cov(x, y) / Var(x) ... but wait, user asked for y = beta * x + epsilon
-    # This implies a regression through origin if no alpha is mentioned.
-    # Standard pairs trading often uses standard OLS with intercept but hedge ratio is just beta.
-    # However, for pure hedge ratio often we regress WITHOUT intercept if we want strict dollar neutrality 
-    # capability without cash component, or WITH intercept if we allow spread mean to be non-zero.
-    # Given "y = beta * x + epsilon", this usually implies keeping the constant term in epsilon or ignoring it.
-    # Let's use np.polyfit(deg=1) which includes intercept, as allows spread to float.
-    # Slope is index 0.
-    
-    try:
-        slope, _ = np.polyfit(x_arr, y_arr, 1)
-        return float(slope)
-    except Exception:
+    # Closed-form simple regression instead of np.polyfit (no Vandermonde matrix / lstsq).
+    if with_intercept:
+        # beta = Cov(x, y) / Var(x). Equivalent to (n*Sxy - Sx*Sy) / (n*Sxx - Sx^2),
+        # but centering first avoids cancellation on price-level inputs.
+        x_arr = x_arr - x_arr.mean()
+        y_arr = y_arr - y_arr.mean()
+        
+    # Regression through the origin: beta = dot(x, y) / dot(x, x)
+    denom = np.dot(x_arr, x_arr)
+    if denom < 1e-18: # Sum of squares, never negative
         return None
+        
+    return float(np.dot(x_arr, y_arr) / denom)
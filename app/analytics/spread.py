@@ -6,7 +6,8 @@ Spread = Y - (Hedge Ratio * X)
 """
 
 import numpy as np
-import pandas as pd
+
+from app.analytics._zscore_numba import _z_of_spread
 
 def compute_spread(x, y, hedge_ratio):
     """
@@ -39,3 +40,37 @@ def compute_spread(x, y, hedge_ratio):
     spread = y_arr - (hedge_ratio * x_arr)
     
     return spread
+
+def compute_zscore_of_spread(x, y, hedge_ratio, window):
+    """
+    Compute the rolling Z-Score of the spread without materializing the spread series.
+    
+    Equivalent to compute_zscore(compute_spread(x, y, hedge_ratio), window), but the
+    spread is computed inside the Z-Score kernel in a single pass.
+    
+    Args:
+        x (array-like): Independent asset prices.
+        y (array-like): Dependent asset prices.
+        hedge_ratio (float): The calculated hedge ratio (beta).
+        window (int): Size of the rolling window.
+        
+    Returns:
+        np.ndarray: Array of spread Z-Scores. First (window-1) elements will be NaN.
+        
+    Raises:
+        ValueError: If x and y have different lengths, hedge_ratio or window is invalid.
+    """
+    if hedge_ratio is None:
+        raise ValueError("Hedge ratio cannot be None.")
+        
+    if window <= 1:
+        raise ValueError("Window size must be greater than 1.")
+        
+    x_arr = np.ascontiguousarray(x, dtype=np.float64)
+    y_arr = np.ascontiguousarray(y, dtype=np.float64)
+    
+    if len(x_arr) != len(y_arr):
+        raise ValueError("Input arrays x and y must have the same length.")
+        
+    out = np.empty(len(x_arr))
+    return _z_of_spread(x_arr, y_arr, float(hedge_ratio), int(window), out)
@@ -6,7 +6,8 @@ Z-Score measures how many standard deviations a data point is from the mean.
 """
 
 import numpy as np
-import pandas as pd
+
+from app.analytics._zscore_numba import _zscore_numba
 
 def compute_zscore(series, window):
     """
@@ -27,26 +28,11 @@ def compute_zscore(series, window):
     if window <= 1:
         raise ValueError("Window size must be greater than 1.")
         
-    # Convert to pandas Series for efficient rolling operations
-    s = pd.Series(series)
+    arr = np.ascontiguousarray(series, dtype=np.float64)
     
-    if len(s) == 0:
+    if len(arr) == 0:
         return np.array([])
         
-    rolling = s.rolling(window=window)
-    r_mean = rolling.mean()
-    r_std = rolling.std(ddof=1) # Sample standard deviation
-    
-    # Compute Z-Score
-    # We use numpy to handle division by zero (resulting in inf) or 0/0 (resulting in NaN) gracefully if needed
-    # But generally pandas handles this well.
-    z_score = (s - r_mean) / r_std
-    
-    # Fill infinite values with NaN to be safe? 
-    # Or keep them as is. Standard behavior is to return what calc gives.
-    # The requirement says "Protect against divide-by-zero".
-    
-    # Replace infinite values with NaN to ensure safety
-    z_score = z_score.replace([np.inf, -np.inf], np.nan)
-    
-    return z_score.to_numpy()
+    # Single pass over the data with Welford running moments (sample std, ddof=1).
+    # Divide-by-zero is protected: zero-variance windows yield NaN instead of Inf.
+    return _zscore_numba(arr, int(window))
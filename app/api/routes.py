@@ -6,12 +6,15 @@ It exposes health checks, analytics data (latest & history), alert status, and c
 """
 
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, HTTPException, Body
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, Body, Header
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from datetime import datetime, timedelta, timezone
 import random
+import threading
+import time
 import numpy as np
+import orjson
 import csv
 import io
 
@@ -19,6 +22,7 @@ import io
 # We will keep the adf_test import if we need to verify stationarity internally, 
 # but the prompt says "GET /analytics/latest" implies we serve pre-calculated data.
 from app.analytics.adf_test import run_adf_test
+from app.ingestion.ring_buffer import RingBuffer
 
 router = APIRouter()
 
@@ -45,11 +49,114 @@ CURRENT_CONFIG = TradingConfig()
 
 # Generate some historical data on startup so charts aren't empty
 HISTORY_LENGTH = 50
-history_data = []
+
+# History is a fixed-size ring buffer of typed records (no per-point dicts):
+# timestamps as epoch microseconds, missing correlation stored as NaN.
+HISTORY_DTYPE = np.dtype([
+    ('ts', 'i8'),
+    ('z', 'f8'),
+    ('spread', 'f8'),
+    ('corr', 'f8'),
+    ('hr', 'f8'),
+])
+history_data = RingBuffer(HISTORY_LENGTH, dtype=HISTORY_DTYPE)
+
+# Guards history_data / latest_alert: written by the ingestion analytics worker thread,
+# read by the API handlers on the event loop.
+STATE_LOCK = threading.Lock()
+
+# History version: bumped on every append / config change. /analytics/history caches its
+# serialized body per version and serves it with an ETag (304 if the client is current).
+_hist_version = 0
+_hist_cache = (-1, b"", "") # (version, body, etag)
+_rows_cache = (-1, []) # (version, rows) shared by /analytics/history, stats and CSV
+_ETAG_PREFIX = f"{time.time_ns():x}" # Distinguishes process restarts
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ALERT_LABELS = ("NONE", "SHORT", "LONG")
+
+def append_history(ts, zscore, spread, correlation, hedge_ratio):
+    """
+    Append a point to the history ring buffer (oldest point is dropped when full).
+    
+    Args:
+        ts (float): Epoch timestamp in seconds.
+        zscore (float): Spread Z-Score.
+        spread (float): Spread value.
+        correlation (float or None): Rolling correlation (None if not available yet).
+        hedge_ratio (float): Hedge ratio used for the spread.
+    """
+    history_data.append((
+        int(ts * 1_000_000),
+        zscore,
+        spread,
+        np.nan if correlation is None else correlation,
+        hedge_ratio
+    ))
+    invalidate_history_cache()
+
+def invalidate_history_cache():
+    """
+    Mark the cached /analytics/history body as stale.
+    """
+    global _hist_version
+    _hist_version += 1
+
+def cached_history_rows():
+    """
+    API rows for the current history version, built once per version.
+    
+    The rows are shared between requests and must not be mutated by callers.
+    
+    Returns:
+        tuple: (version, rows) with rows in chronological order.
+    """
+    global _rows_cache
+    with STATE_LOCK:
+        version = _hist_version
+        cached = _rows_cache
+        
+        # Snapshot only if the cached rows are stale: rows are built after the lock is released
+        hist = None if cached[0] == version else history_data.view().copy()
+        
+    if hist is not None:
+        cached = _rows_cache = (version, history_rows(hist))
+    return cached
+
+def history_rows(hist):
+    """
+    Convert history records to API rows.
+    
+    Derived fields (is_stationary, alert) are computed vectorized against the
+    current config, so config changes apply without touching stored records.
+    
+    Args:
+        hist (np.ndarray): Records with HISTORY_DTYPE.
+        
+    Returns:
+        list: Row dicts in the same order as hist.
+    """
+    threshold = CURRENT_CONFIG.zscore_entry_threshold
+    z = hist['z']
+    
+    stationary = (np.abs(z) < threshold).tolist()
+    alert = np.where(z > threshold, 1, np.where(z < -threshold, 2, 0)).tolist()
+    
+    rows = []
+    for (ts, zscore, spread, corr, hr), st, al in zip(hist.tolist(), stationary, alert):
+        rows.append({
+            "timestamp": (_EPOCH + timedelta(microseconds=ts)).isoformat(),
+            "zscore": zscore,
+            "spread": spread,
+            "correlation": None if corr != corr else corr, # NaN -> None
+            "hedge_ratio": hr,
+            "is_stationary": st,
+            "alert": _ALERT_LABELS[al]
+        })
+    return rows
 
 def generate_history():
-    global history_data
-    history_data = []
+    history_data.clear()
     now = get_utc_now()
     base_spread = 100.0
     base_zscore = 0.0
@@ -63,13 +170,13 @@ def generate_history():
         base_zscore = random.uniform(-2.5, 2.5)
         correlation = random.uniform(0.6, 0.99)
         
-        history_data.append({
-            "timestamp": t.isoformat(),
-            "zscore": base_zscore,
-            "spread": max(0, base_spread), # Ensure non-negative per requirement
-            "correlation": correlation,
-            "hedge_ratio": 1.2 + random.uniform(-0.1, 0.1)
-        })
+        append_history(
+            t.timestamp(),
+            base_zscore,
+            max(0, base_spread), # Ensure non-negative per requirement
+            correlation,
+            1.2 + random.uniform(-0.1, 0.1)
+        )
 
 generate_history()
 
@@ -78,7 +185,10 @@ def get_latest_data():
     if not history_data:
         generate_history()
     
-    latest = history_data[-1]
+    with STATE_LOCK:
+        latest = history_rows(history_data.view()[-1:])[0]
+        points_collected = len(history_data)
+        
     # Update timestamp to "now" to simulate live feed if polled
     latest_copy = latest.copy()
     latest_copy["timestamp"] = get_utc_now_iso()
@@ -86,13 +196,12 @@ def get_latest_data():
     # Calculate stationarity (simple mock logic or real ADF)
     # Using real ADF on the Z-score history if possible
     # For now, simplistic check based on Z-score threshold
-    is_stationary = abs(latest["zscore"]) < CURRENT_CONFIG.zscore_entry_threshold
+    is_stationary = latest["is_stationary"]
     
     # Task 2: Warm-up metadata
     # WINDOW_SIZE is defined in binance_ws, but we can reuse HISTORY_LENGTH here as they align in concept for now
     # Or define WINDOW_SIZE explicitly as requested.
     WINDOW_SIZE = 50 
-    points_collected = len(history_data)
     warmup = points_collected < WINDOW_SIZE
     
     # Filter alert if correlation is low? 
@@ -159,6 +268,9 @@ class StatsResponse(BaseModel):
 
 # --- Endpoints ---
 
+# Rows per chunk when streaming the stats CSV
+CSV_FLUSH_ROWS = 64
+
 @router.get("/health", response_model=HealthResponse)
 async def get_health():
     """Health check endpoint."""
@@ -171,34 +283,51 @@ async def get_analytics_latest():
     return get_latest_data()
 
 @router.get("/analytics/history")
-async def get_analytics_history():
-    """Get historical data series for charts."""
+async def get_analytics_history(if_none_match: Optional[str] = Header(None)):
+    """Get historical data series for charts (ETag-cached)."""
+    global _hist_cache
+    
     # In live app, you might want to append a 'fresh' point or shift the window
     # For this demo, we can shift the history slightly to simulate time passing
     # or just return the static generated history.
     # Let's shift it if called to make it feel alive.
     
-    global history_data
-    last_time = datetime.fromisoformat(history_data[-1]["timestamp"])
-    now = get_utc_now()
-    
-    # If more than 1 minute passed, add a point
-    if (now - last_time).total_seconds() > 60:
-         new_point = history_data[-1].copy()
-         new_point["timestamp"] = now.isoformat()
-         new_point["zscore"] = random.uniform(-2.5, 2.5)
-         new_point["spread"] = max(0, new_point["spread"] + random.uniform(-1, 1))
-         history_data.append(new_point)
-         history_data.pop(0) # Keep window fixed size
-         
-    return {"series": history_data}
+    with STATE_LOCK:
+        last = history_data.last()
+        now = get_utc_now()
+        
+        # If more than 1 minute passed, add a point
+        if now.timestamp() - last['ts'] / 1_000_000 > 60:
+             append_history(
+                 now.timestamp(),
+                 random.uniform(-2.5, 2.5),
+                 max(0, last['spread'] + random.uniform(-1, 1)),
+                 float(last['corr']),
+                 float(last['hr'])
+             ) # Ring buffer keeps window fixed size
+             
+    version, rows = cached_history_rows()
+    cached = _hist_cache
+    if cached[0] != version:
+        body = orjson.dumps({"series": rows})
+        cached = _hist_cache = (version, body, f'"{_ETAG_PREFIX}-{version}"')
+        
+    _, body, etag = cached
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+        
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 @router.get("/alerts/latest", response_model=AlertResponse)
 async def get_latest_alert_endpoint():
     """Get the latest trading alert."""
-    # Update timestamp to keep it fresh
-    latest_alert["timestamp"] = get_utc_now_iso()
-    return latest_alert
+    # Copy under the lock so the response never mixes two alerts
+    with STATE_LOCK:
+        alert = dict(latest_alert)
+        
+    # Update timestamp to keep it fresh (on the copy, not the shared state)
+    alert["timestamp"] = get_utc_now_iso()
+    return alert
 
 
 @router.get("/config", response_model=TradingConfig)
@@ -216,6 +345,10 @@ async def update_config(config: TradingConfig):
     
     global CURRENT_CONFIG
     CURRENT_CONFIG = config
+    
+    # Derived fields (is_stationary, alert) depend on the thresholds
+    with STATE_LOCK:
+        invalidate_history_cache()
     return CURRENT_CONFIG
 
 @router.get("/analytics/stats", response_model=StatsResponse)
@@ -223,75 +356,48 @@ async def get_analytics_stats():
     """
     Return time-series analytics in tabular format suitable for UI + CSV.
     """
-    global history_data
-    stats_rows = []
-    
-    # Process history data to generate derived fields
     # Return in reverse chronological order (newest first) for Table UI
-    for point in reversed(history_data):
-        z = point["zscore"]
-        
-        # Calculate derived fields
-        # Using CURRENT_CONFIG attributes
-        is_stationary = abs(z) < CURRENT_CONFIG.zscore_entry_threshold
-        
-        alert_status = "NONE"
-        if z > CURRENT_CONFIG.zscore_entry_threshold:
-            alert_status = "SHORT"
-        elif z < -CURRENT_CONFIG.zscore_entry_threshold:
-            alert_status = "LONG"
-            
-        stats_rows.append({
-            "timestamp": point["timestamp"],
-            "zscore": z,
-            "spread": point["spread"],
-            "correlation": point["correlation"],
-            "is_stationary": is_stationary,
-            "alert": alert_status
-        })
-        
-    return {"rows": stats_rows}
+    return {"rows": cached_history_rows()[1][::-1]}
 
 @router.get("/analytics/stats/csv")
 async def get_analytics_stats_csv():
     """
     Generates CSV dynamically from stats data.
-    Stream CSV from memory.
+    Streams CSV in chunks of CSV_FLUSH_ROWS rows, so the first bytes go out
+    before the whole file is built.
     """
-    # Reuse the same logic as get_analytics_stats
-    global history_data
-    
-    # Create an in-memory string buffer
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Write Header
-    writer.writerow(["timestamp", "zscore", "spread", "correlation", "is_stationary", "alert"])
+    # Reuse the same rows as get_analytics_stats (newest first)
+    rows = cached_history_rows()[1][::-1]
     
-    # Write Rows (Newest first)
-    for point in reversed(history_data):
-        z = point["zscore"]
-        is_stationary = abs(z) < runtime_config["z_threshold"]
+    async def _rows():
+        # Small reusable buffer, flushed and reset every CSV_FLUSH_ROWS rows
+        buf = io.StringIO()
+        writer = csv.writer(buf)
         
-        alert_status = "NONE"
-        if z > runtime_config["z_threshold"]:
-            alert_status = "SHORT"
-        elif z < -runtime_config["z_threshold"]:
-            alert_status = "LONG"
-            
-        writer.writerow([
-            point["timestamp"],
-            z,
-            point["spread"],
-            point["correlation"],
-            is_stationary,
-            alert_status
-        ])
+        # Write Header
+        writer.writerow(["timestamp", "zscore", "spread", "correlation", "is_stationary", "alert"])
         
-    output.seek(0)
+        # Write Rows (Newest first)
+        for i, point in enumerate(rows, 1):
+            writer.writerow([
+                point["timestamp"],
+                point["zscore"],
+                point["spread"],
+                point["correlation"],
+                point["is_stationary"],
+                point["alert"]
+            ])
+            
+            if i % CSV_FLUSH_ROWS == 0:
+                yield buf.getvalue().encode()
+                buf.seek(0)
+                buf.truncate(0)
+                
+        if buf.tell():
+            yield buf.getvalue().encode()
     
     return StreamingResponse(
-        iter([output.getvalue()]),
+        _rows(),
         media_type="text/csv",
         headers={"Content-Disposition": 'attachment; filename="analytics_stats.csv"'}
     )
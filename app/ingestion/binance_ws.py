@@ -1,80 +1,177 @@
 
 import asyncio
-import json
 import logging
+import threading
 import time
 from collections import deque
-from datetime import datetime, timezone
+import orjson
 import websockets
 import numpy as np
-from app.api.routes import history_data, latest_alert, CURRENT_CONFIG
+from app.analytics.correlation import compute_correlation
+from app.analytics.spread import compute_zscore_of_spread
+from app.ingestion.ring_buffer import RingBuffer
+from app.api import routes
+from app.api.routes import latest_alert, append_history, STATE_LOCK
 
 # Configuration
 # Using Futures stream as requested: fstream.binance.com
 # Stream names are lowercase: btcusdt@trade / ethusdt@trade
-URI = "wss://fstream.binance.com/ws/btcusdt@trade/ethusdt@trade"
+# Combined-stream endpoint: frames are wrapped as {"stream": ..., "data": {...}}
+URI = "wss://fstream.binance.com/stream?streams=btcusdt@trade/ethusdt@trade"
 WINDOW_SIZE = 50 
 
-# State Buffers
-btc_prices = deque(maxlen=WINDOW_SIZE)
-eth_prices = deque(maxlen=WINDOW_SIZE)
-spread_history = deque(maxlen=WINDOW_SIZE)
+# Payload keys / symbols (pre-bound constants for the per-message hot path)
+_DATA = 'data'
+_S = 's'
+_P = 'p'
+_BTC = 'BTCUSDT'
+_ETH = 'ETHUSDT'
+
+# State Buffers (preallocated float64 ring buffers; analytics read zero-copy views)
+btc_prices = RingBuffer(WINDOW_SIZE)
+eth_prices = RingBuffer(WINDOW_SIZE)
+# Aligned (BTC, ETH) price snapshots at each analytics tick, for the spread Z-Score
+spread_btc = RingBuffer(WINDOW_SIZE)
+spread_eth = RingBuffer(WINDOW_SIZE)
 
 # Logger
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("BinanceWS")
 
+# Ingestion -> analytics hand-off.
+# The WebSocket coroutine only parses frames and enqueues (symbol, price, ts) ticks;
+# a worker thread drains them and runs the analytics, keeping the event loop free.
+TICK_QUEUE_SIZE = 1024
+TICK_BATCH_SIZE = 64
+_tick_q = deque(maxlen=TICK_QUEUE_SIZE)
+_tick_event = threading.Event()
+_worker = None
+
+# Cached 'YYYY-MM-DDTHH:MM:SS' prefix for the last formatted second (worker thread only)
+_iso_sec = -1
+_iso_prefix = ""
+
 async def start_binance_ws():
     """
     Connects to Binance WebSocket and ingests live market data.
     """
+    _start_analytics_worker()
+    
     while True:
         try:
             async with websockets.connect(URI) as websocket:
                 logger.info("Connected to Binance WebSocket")
                 while True:
                     msg = await websocket.recv()
-                    data = json.loads(msg)
-                    process_message(data)
-        except Exception as e:
-            logger.error(f"WebSocket connection failed: {e}. Retrying in 5s...")
+                    process_message(msg)
+        # Connection-level failures (network, handshake, closed socket)
+        except (OSError, websockets.exceptions.WebSocketException) as e:
+            logger.error("WebSocket connection failed: %s. Retrying in 5s...", e)
             await asyncio.sleep(5)
+        # Anything else is a bug, but this loop runs as a fire-and-forget task:
+        # log it with the traceback and keep ingesting rather than dying silently
+        except Exception:
+            logger.exception("Unexpected error in Binance WebSocket loop. Retrying in 5s...")
+            await asyncio.sleep(5)
+
+def _start_analytics_worker():
+    """
+    Start the analytics worker thread (once).
+    """
+    global _worker
+    if _worker is None or not _worker.is_alive():
+        _worker = threading.Thread(target=_analytics_worker, name="AnalyticsWorker", daemon=True)
+        _worker.start()
 
-def process_message(data):
+def _analytics_worker():
     """
-    Normalizes message and updates analytics.
-    Payload Example: {"e":"trade", "s":"BTCUSDT", "p":"98000.50", "T":1678900000000, ...}
+    Drain queued ticks in batches and run analytics once per batch.
     """
+    while True:
+        _tick_event.wait()
+        _tick_event.clear()
+        
+        while _tick_q:
+            batch = []
+            while _tick_q and len(batch) < TICK_BATCH_SIZE:
+                batch.append(_tick_q.popleft())
+            process_ticks(batch)
+
+def process_message(msg):
+    """
+    Parses a raw combined-stream trade frame and queues it for the analytics worker.
+    Payload Example: {"stream":"btcusdt@trade", "data":{"e":"trade", "s":"BTCUSDT", "p":"98000.50", ...}}
+    """
+    # Frames for other symbols are dropped before paying for a JSON parse
+    if _BTC not in msg and _ETH not in msg:
+        return
+        
     try:
-        symbol = data.get('s')
-        price = float(data.get('p', 0))
+        data = orjson.loads(msg)
+        try:
+            data = data[_DATA]
+            symbol = data[_S]
+            price = float(data[_P])
+        except KeyError:
+            return
         
         # Use ingestion time with high precision as requested
         # 'T' is trade time, but user requested time.time() (float, includes milliseconds)
-        # We allow isoformat() to include the fractional seconds by default
-        timestamp_str = datetime.fromtimestamp(time.time(), timezone.utc).isoformat()
-        
-        
+        _tick_q.append((symbol, price, time.time()))
+        _tick_event.set()
+            
+    # Malformed frames only (orjson.JSONDecodeError is a ValueError); other errors propagate
+    except (KeyError, ValueError, TypeError) as e:
+        logger.warning("Error processing message: %s", e)
+
+def process_ticks(ticks):
+    """
+    Update price buffers with a batch of (symbol, price, ts) ticks,
+    then run the analytics once for the most recent state.
+    """
+    last_ts = None
+    for symbol, price, ts in ticks:
         # Update Price Buffers
-        if symbol == 'BTCUSDT':
+        if symbol == _BTC:
             btc_prices.append(price)
-        elif symbol == 'ETHUSDT':
+        elif symbol == _ETH:
             eth_prices.append(price)
         else:
-            return
+            continue
+        last_ts = ts
+        
+    if last_ts is None:
+        return
+        
+    # Trigger Analytics Update
+    # We update if we have at least minimal data for both
+    if len(btc_prices) > 1 and len(eth_prices) > 1:
+        try:
+            update_analytics(last_ts)
+        except Exception as e:
+            logger.warning("Error updating analytics: %s", e)
 
-        # Trigger Analytics Update
-        # We update if we have at least minimal data for both
-        if len(btc_prices) > 1 and len(eth_prices) > 1:
-            update_analytics(timestamp_str)
-            
-    except Exception as e:
-        logger.warning(f"Error processing message: {e}")
+def _iso_utc(ts):
+    """
+    Format an epoch timestamp as ISO 8601 UTC with microseconds ('...T12:00:00.123456+00:00').
+    Cheaper than datetime.fromtimestamp(ts, timezone.utc).isoformat(): the strftime prefix
+    is only rebuilt when the second changes, so ticks within a second only format the tail.
+    """
+    global _iso_sec, _iso_prefix
+    sec = int(ts)
+    us = round((ts - sec) * 1_000_000)
+    if us >= 1_000_000:
+        sec += 1
+        us -= 1_000_000
+    if sec != _iso_sec:
+        _iso_prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(sec))
+        _iso_sec = sec
+    return f"{_iso_prefix}.{us:06d}+00:00"
 
-def update_analytics(timestamp):
+def update_analytics(ts):
     # 1. Fetch latest prices
-    current_btc = btc_prices[-1]
-    current_eth = eth_prices[-1]
+    current_btc = btc_prices.last()
+    current_eth = eth_prices.last()
     
     # 2. Compute Spread
     # Using a simple fixed ratio for stability in this demo context, 
@@ -86,38 +183,42 @@ def update_analytics(timestamp):
     HEDGE_RATIO = 25.0 
     spread = current_btc - (HEDGE_RATIO * current_eth)
     
-    spread_history.append(spread)
+    spread_btc.append(current_btc)
+    spread_eth.append(current_eth)
     
-    if len(spread_history) < 5:
+    if len(spread_btc) < 5:
         return
 
     # 3. Compute Z-Score
-    spreads_arr = np.array(spread_history)
-    mean_spread = np.mean(spreads_arr)
-    std_spread = np.std(spreads_arr)
+    # Fused kernel: the spread series is computed inside the rolling Z-Score pass
+    # over the whole buffer, so only the last value is meaningful.
+    # ETH is the independent leg (x) and BTC the dependent one (y): y - hr*x = BTC - 25*ETH.
+    z_arr = compute_zscore_of_spread(
+        spread_eth.view(), spread_btc.view(), HEDGE_RATIO, len(spread_btc)
+    )
     
     zscore = 0.0
-    if std_spread > 1e-6:
-        zscore = (spread - mean_spread) / std_spread
+    if np.isfinite(z_arr[-1]):
+        zscore = z_arr[-1]
         
     # 4. Compute Correlation
     # We take the aligned tail of both queues
     min_len = min(len(btc_prices), len(eth_prices))
     
-    btc_arr = np.array(list(btc_prices)[-min_len:])
-    eth_arr = np.array(list(eth_prices)[-min_len:])
+    btc_arr = btc_prices.view()[-min_len:]
+    eth_arr = eth_prices.view()[-min_len:]
 
-    if len(btc_arr) < 20 or np.std(btc_arr) < 1e-6 or np.std(eth_arr) < 1e-6:
+    if min_len < 20:
         corr = None
     else:
-        corr = float(np.corrcoef(btc_arr, eth_arr)[0, 1])
+        # None if either leg is flat (std < 1e-6)
+        corr = compute_correlation(btc_arr, eth_arr)
     
     correlation = corr
 
-    # 5. Stationarity Check
-    is_stationary = abs(zscore) < CURRENT_CONFIG.zscore_entry_threshold
-    
-    # 6. Update Shared Runtime State
+    # 5. Update Shared Runtime State
+    # ISO 8601 with fractional seconds, same shape as datetime.isoformat()
+    timestamp = _iso_utc(ts)
     new_data_point = {
         "timestamp": timestamp,
         "zscore": float(zscore),
@@ -126,18 +227,20 @@ def update_analytics(timestamp):
         "hedge_ratio": float(HEDGE_RATIO)
     }
     
-    # Atomic List Update (GIL protected)
-    history_data.append(new_data_point)
-    if len(history_data) > WINDOW_SIZE:
-        history_data.pop(0)
-        
-    # 7. Check Alerts
-    update_alerts(new_data_point)
+    # Shared with the API handlers, which run on the event loop thread
+    with STATE_LOCK:
+        # 6. Record history (stationarity / alert status are derived when rows are served)
+        append_history(ts, float(zscore), float(spread), correlation, float(HEDGE_RATIO))
+            
+        # 7. Check Alerts
+        update_alerts(new_data_point)
 
 def update_alerts(data):
     z = data['zscore']
-    threshold = CURRENT_CONFIG.zscore_entry_threshold
-    min_corr = CURRENT_CONFIG.min_correlation
+    # Read through the module: POST /config rebinds routes.CURRENT_CONFIG
+    config = routes.CURRENT_CONFIG
+    threshold = config.zscore_entry_threshold
+    min_corr = config.min_correlation
     corr = data.get('correlation')
     
     # Filter by Correlation
@@ -0,0 +1,75 @@
+"""
+Ring Buffer Module.
+
+Fixed-capacity NumPy ring buffer for rolling price windows. Replaces deque->np.array
+conversions on every tick: appends are two scalar writes and the window is exposed
+as a zero-copy, chronologically ordered view.
+"""
+
+import numpy as np
+
+class RingBuffer:
+    def __init__(self, capacity, dtype=np.float64):
+        """
+        Initialize the ring buffer.
+        
+        Args:
+            capacity (int): Maximum number of items kept (oldest are overwritten).
+            dtype (np.dtype): Item dtype (default: float64).
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1.")
+            
+        self.capacity = capacity
+        
+        # Mirrored storage: every item is written at `head` and `head + capacity`,
+        # so the last `capacity` items are always one contiguous slice.
+        self._data = np.zeros(2 * capacity, dtype=dtype)
+        self._head = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, value):
+        """
+        Append an item, overwriting the oldest one when full.
+        """
+        head = self._head
+        self._data[head] = value
+        self._data[head + self.capacity] = value
+        
+        self._head = head + 1 if head + 1 < self.capacity else 0
+        if self._count < self.capacity:
+            self._count += 1
+
+    def clear(self):
+        """
+        Drop all items (storage is kept).
+        """
+        self._head = 0
+        self._count = 0
+
+    def last(self):
+        """
+        Return the most recent item.
+        
+        Raises:
+            IndexError: If the buffer is empty.
+        """
+        if self._count == 0:
+            raise IndexError("last() on empty RingBuffer")
+        return self._data[self._head + self.capacity - 1]
+
+    def view(self):
+        """
+        Return the buffered items in chronological order (oldest first).
+        
+        Returns:
+            np.ndarray: Contiguous read-only view into the buffer (no copy).
+                Only valid until the next append.
+        """
+        end = self._head + self.capacity
+        v = self._data[end - self._count:end]
+        v.flags.writeable = False
+        return v
@@ -17,9 +17,19 @@ import json
 import logging
 import signal
 import sys
-from datetime import datetime, timezone
 import websockets
 
+# orjson parses ~2-6x faster than stdlib json and accepts bytes directly
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+    _JSONDecodeError = orjson.JSONDecodeError
+except ImportError:
+    _loads = json.loads
+    _dumps = json.dumps
+    _JSONDecodeError = json.JSONDecodeError
+
 from app.sampling.sampler import Sampler
 
 # Configure logging to stdout
@@ -30,6 +40,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Trade payloads start with '{"e":"trade"'; acks ('{"result":null,"id":1}') and other
+# event types are dropped before JSON parsing
+_TRADE_PREFIX = b'{"e":"trade"'
+
+# Receive loop -> sampler task hand-off. The sampler task drains whatever is
+# queued (up to a batch) each time it runs.
+SAMPLER_QUEUE_SIZE = 1024
+SAMPLER_BATCH_SIZE = 64
+
 class BinanceWebsocketClient:
     def __init__(self, symbols):
         """
@@ -42,6 +61,17 @@ class BinanceWebsocketClient:
         self.base_url = "wss://fstream.binance.com/ws"
         self.running = False
         self.sampler = Sampler()
+        self._queue = asyncio.Queue(maxsize=SAMPLER_QUEUE_SIZE)
+        
+        # Subscription message, serialized once (bytes with orjson). It is sent with
+        # text=True so it stays a text frame without a UTF-8 encode on send.
+        params = [f"{s}@trade" for s in self.symbols]
+        self._sub_payload = _dumps({
+            "method": "SUBSCRIBE",
+            "params": params,
+            "id": 1
+        })
+        self._sub_log = f"Subscribed to: {', '.join(params)}"
         
     def normalize(self, message):
         """
@@ -53,19 +83,21 @@ class BinanceWebsocketClient:
         Returns:
             dict: Normalized trade data or None if invalid
         """
-        try:
-            # Binance trade message format checks
-            if 'e' in message and message['e'] == 'trade':
-                return {
-                    'timestamp': datetime.fromtimestamp(message['T'] / 1000, tz=timezone.utc).isoformat(),
-                    'symbol': message['s'],
-                    'price': float(message['p']),
-                    'quantity': float(message['q'])
-                }
-            # Handle other message types or return None
+        # Binance trade message format check; other message types return None
+        if message.get('e') != 'trade':
             return None
-        except Exception as e:
-            logger.error(f"Error normalizing message: {e}")
+        
+        try:
+            return {
+                # Exchange trade time, integer milliseconds since epoch (UTC)
+                'timestamp': message['T'],
+                'symbol': message['s'],
+                'price': float(message['p']),
+                'quantity': float(message['q'])
+            }
+        except (KeyError, ValueError, TypeError) as e:
+            # Malformed trade frame: expected occasionally, not an application error
+            logger.debug("Malformed trade message: %s", e)
             return None
 
     def log_trade(self, trade):
@@ -75,53 +107,118 @@ class BinanceWebsocketClient:
         """
         pass
 
+    def _flush(self, batch):
+        """
+        Hand a batch of normalized trades to the Sampler.
+        The Sampler does no per-tick error handling; failures are logged here.
+        """
+        try:
+            self.sampler.process_ticks(batch)
+        except Exception as e:
+            logger.error("Error processing ticks in Sampler: %s", e)
+
+    async def _sampler_loop(self):
+        """
+        Consume queued trades and feed them to the Sampler in batches,
+        so sampler work never runs inside the receive loop.
+        """
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < SAMPLER_BATCH_SIZE:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            self._flush(batch)
+
+    def _drain_queue(self):
+        """
+        Flush trades still queued for the Sampler (used on shutdown).
+        """
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if batch:
+            self._flush(batch)
+
     async def subscribe(self, ws):
         """
         Send subscription message to the WebSocket.
         """
-        params = [f"{s}@trade" for s in self.symbols]
-        sub_msg = {
-            "method": "SUBSCRIBE",
-            "params": params,
-            "id": 1
-        }
-        await ws.send(json.dumps(sub_msg))
-        logger.info(f"Subscribed to: {', '.join(params)}")
+        # Payload is built once in __init__; reconnects only resend it
+        await ws.send(self._sub_payload, text=True)
+        logger.info(self._sub_log)
 
     async def connect(self):
         """
         Main connection loop with reconnection logic.
+        Runs the receive loop alongside the sampler task until stopped.
         """
         self.running = True
+        sampler_task = asyncio.create_task(self._sampler_loop())
+        try:
+            await self._receive_loop()
+        finally:
+            sampler_task.cancel()
+            self._drain_queue()
+
+    async def _receive_loop(self):
+        """
+        Receive, filter and parse frames; queue normalized trades for the sampler task.
+
+        Frames are read with recv(decode=False): text frames come back as raw bytes,
+        skipping websockets' UTF-8 decode/validation pass. The JSON parser validates
+        the payload anyway, so a malformed frame surfaces as a decode error instead.
+        recv(decode=...) and send(text=...) need the asyncio implementation that
+        websockets.connect points to from websockets 14.0 on (see requirements.txt).
+        """
+        queue = self._queue
         while self.running:
             try:
                 logger.info(f"Connecting to {self.base_url}...")
-                async with websockets.connect(self.base_url) as ws:
+                # Trade frames are tiny, permessage-deflate costs more than it saves.
+                # A short receive queue pushes back on the socket if the sampler stalls.
+                async with websockets.connect(
+                    self.base_url, compression=None, max_size=2**20, max_queue=32
+                ) as ws:
                     await self.subscribe(ws)
                     
-                    async for message in ws:
-                        if not self.running:
+                    # Bursts are drained without extra event-loop round trips: recv() only
+                    # suspends when no complete frame is buffered, and the sampler task
+                    # picks up everything queued meanwhile as one batch.
+                    while self.running:
+                        try:
+                            message = await ws.recv(decode=False)
+                        except websockets.ConnectionClosedOK:
                             break
                             
+                        # LBYL: only trade frames are worth a parse
+                        if not message.startswith(_TRADE_PREFIX):
+                            continue
+
                         try:
-                            data = json.loads(message)
+                            data = _loads(message)
                             
                             # Process trade data
                             trade = self.normalize(data)
                             if trade:
-                                # Phase 2: Pass to sampler
-                                self.sampler.process_tick(trade)
+                                # Phase 2: Pass to sampler (via the sampler task)
+                                try:
+                                    queue.put_nowait(trade)
+                                except asyncio.QueueFull:
+                                    logger.warning("Sampler queue full, dropping trade")
                                 
-                        except json.JSONDecodeError:
+                        except _JSONDecodeError:
                             logger.error("Failed to decode message")
                         except Exception as e:
-                            logger.error(f"Error processing message: {e}")
+                            logger.error("Error processing message: %s", e)
                             
             except (websockets.ConnectionClosed, asyncio.TimeoutError) as e:
-                logger.warning(f"Connection lost: {e}. Reconnecting in 5 seconds...")
+                logger.warning("Connection lost: %s. Reconnecting in 5 seconds...", e)
                 await asyncio.sleep(5)
             except Exception as e:
-                logger.error(f"Unexpected error: {e}. Reconnecting in 5 seconds...")
+                logger.error("Unexpected error: %s. Reconnecting in 5 seconds...", e)
                 await asyncio.sleep(5)
 
     def stop(self):
@@ -153,6 +250,13 @@ if __name__ == "__main__":
     if sys.platform == 'win32':
         # Windows-specific event loop policy
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    else:
+        # libuv-based loop: lower per-message dispatch overhead on the receive path
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
         
     try:
         # Windows signal handling workaround for asyncio
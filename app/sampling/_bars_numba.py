@@ -0,0 +1,99 @@
+"""
+Numba OHLCV Kernels.
+
+JIT-compiled per-tick bar update for the Sampler's structure-of-arrays bar store
+(one row per symbol id, one column per timeframe). Logging and formatting of closed
+bars stay in Python; the kernel only reports which bars it closed.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, nogil=True)
+def _update_bars(bar_open, bar_high, bar_low, bar_close, bar_volume, bar_count, bar_start,
+                 timeframes, sym_ids, ts_sec, prices, qtys, now,
+                 closed_slots, closed_vals, created):
+    """
+    Apply a batch of ticks (oldest first) to the active bars in place.
+
+    A tick whose period already ended in wall-clock time (`now`) is skipped for that
+    timeframe. A tick for a new period closes the slot's current bar and starts a new one.
+
+    Outputs (preallocated with at least len(sym_ids) * len(timeframes) rows):
+        closed_slots: (sym_id, tf_idx) of each bar closed by the batch, in order
+        closed_vals: (start, open, high, low, close, volume) of each closed bar
+        created: (sym_id, tf_idx, start) of each bar started by the batch
+
+    Returns:
+        tuple: (number of closed bars, number of created bars)
+    """
+    n_closed = 0
+    n_created = 0
+    for i in range(sym_ids.shape[0]):
+        s = sym_ids[i]
+        t = ts_sec[i]
+        price = prices[i]
+        qty = qtys[i]
+        for j in range(timeframes.shape[0]):
+            tf = timeframes[j]
+            # Align to the start of the period (wall-clock time)
+            start = t - t % tf
+            if start + tf < now:
+                continue
+
+            cur = bar_start[s, j]
+            if cur == start:
+                # Same period, update bar
+                if price > bar_high[s, j]:
+                    bar_high[s, j] = price
+                if price < bar_low[s, j]:
+                    bar_low[s, j] = price
+                bar_close[s, j] = price
+                bar_volume[s, j] += qty
+                bar_count[s, j] += 1
+                continue
+
+            if cur >= 0:
+                # New period: hand the old bar back to be finalized
+                closed_slots[n_closed, 0] = s
+                closed_slots[n_closed, 1] = j
+                closed_vals[n_closed, 0] = cur
+                closed_vals[n_closed, 1] = bar_open[s, j]
+                closed_vals[n_closed, 2] = bar_high[s, j]
+                closed_vals[n_closed, 3] = bar_low[s, j]
+                closed_vals[n_closed, 4] = bar_close[s, j]
+                closed_vals[n_closed, 5] = bar_volume[s, j]
+                n_closed += 1
+
+            # Start a new bar
+            bar_open[s, j] = price
+            bar_high[s, j] = price
+            bar_low[s, j] = price
+            bar_close[s, j] = price
+            bar_volume[s, j] = qty
+            bar_count[s, j] = 1
+            bar_start[s, j] = start
+            created[n_created, 0] = s
+            created[n_created, 1] = j
+            created[n_created, 2] = start
+            n_created += 1
+
+    return n_closed, n_created
+
+
+def _warmup():
+    """
+    Compile (or load from the on-disk cache) the kernel at import time, so the
+    first live tick does not pay the JIT cost.
+    """
+    f = np.zeros((1, 1))
+    i = np.full((1, 1), -1, dtype=np.int64)
+    one = np.zeros(1, dtype=np.int64)
+    _update_bars(f, f.copy(), f.copy(), f.copy(), f.copy(), i.copy(), i,
+                 np.ones(1, dtype=np.int64), one, one, np.ones(1), np.ones(1), 0.0,
+                 np.empty((1, 2), dtype=np.int64), np.empty((1, 6)),
+                 np.empty((1, 3), dtype=np.int64))
+
+
+_warmup()
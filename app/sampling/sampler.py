@@ -7,8 +7,16 @@ It maintains in-memory buffers and handles time-alignment logic.
 """
 
 import sys
+import atexit
+import heapq
 import logging
-from datetime import datetime, timedelta, timezone
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+from datetime import datetime, timezone
+import numpy as np
+
+from app.sampling._bars_numba import _update_bars
 
 # Configure logging
 logging.basicConfig(
@@ -18,6 +26,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+_log_listener = None
+
+def _start_queue_logging():
+    """
+    Route this module's records through a queue to a listener thread (once), so
+    stdout writes for closed bars never block the event loop.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+    
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    _log_listener = QueueListener(log_queue, handler)
+    _log_listener.start()
+    # Flush pending records on interpreter exit
+    atexit.register(_log_listener.stop)
+    
+    logger.addHandler(QueueHandler(log_queue))
+    logger.propagate = False
+
+# Minimum wall-clock interval between closure sweeps (seconds)
+SWEEP_INTERVAL = 0.1
+
 class Sampler:
     def __init__(self):
         """
@@ -26,137 +59,204 @@ class Sampler:
         """
         # Timeframes in seconds: 1s, 1m (60s), 5m (300s)
         self.timeframes = [1, 60, 300]
+        self._tf = np.array(self.timeframes, dtype=np.int64)
+        # Log labels per timeframe index, padded to the 3-char column width
+        self._tf_labels = [
+            "{:<3}".format(f"{tf // 60}M" if tf >= 60 else f"{tf}S") for tf in self.timeframes
+        ]
+        
+        # Symbol <-> row id mapping, ids are assigned on first sight (monotonic, never reused).
+        # Everything past the batch conversion works on integer ids only.
+        self._symbols = []
+        self._sym_id = {}
+        
+        # Active bars, structure-of-arrays: one row per symbol id, one column per timeframe.
+        # bar_start == -1 marks "no active bar" for that (symbol, timeframe) slot.
+        self._allocate(4)
+        
+        # Min-heap of (end_sec, sym_id, tf_idx, start_sec), one entry per bar created.
+        # Entries whose slot has since been finalized or restarted are stale and skipped.
+        self._closures = []
+        self._last_sweep = float('-inf')
+        
+        # Kernel output buffers, reused across batches (grown on demand)
+        self._closed_slots = np.empty((0, 2), dtype=np.int64)
+        self._closed_vals = np.empty((0, 6))
+        self._created = np.empty((0, 3), dtype=np.int64)
         
-        # Structure: {(symbol, timeframe_sec): current_bar_dict}
-        self.active_bars = {}
+        _start_queue_logging()
 
-    def _get_period_start(self, timestamp: datetime, period_seconds: int) -> datetime:
+    def _allocate(self, capacity: int):
         """
-        Align timestamp to the start of the period (wall-clock time).
+        (Re)allocate the bar arrays for `capacity` symbols, keeping existing rows.
         """
-        timestamp_sec = timestamp.timestamp()
-        aligned_sec = (timestamp_sec // period_seconds) * period_seconds
-        return datetime.fromtimestamp(aligned_sec, tz=timezone.utc)
+        shape = (capacity, len(self.timeframes))
+        old = getattr(self, 'bar_start', None)
+        
+        arrays = {
+            'bar_open': np.zeros(shape),
+            'bar_high': np.zeros(shape),
+            'bar_low': np.zeros(shape),
+            'bar_close': np.zeros(shape),
+            'bar_volume': np.zeros(shape),
+            'bar_count': np.zeros(shape, dtype=np.int64),
+            'bar_start': np.full(shape, -1, dtype=np.int64),
+        }
+        for name, arr in arrays.items():
+            if old is not None:
+                prev = getattr(self, name)
+                arr[:prev.shape[0]] = prev
+            setattr(self, name, arr)
 
-    def _create_bar(self, symbol: str, start_time: datetime, period_seconds: int, price: float, qty: float) -> dict:
+    def _symbol_id(self, symbol: str) -> int:
         """
-        Create a new OHLCV bar with explicit start and end times.
+        Return the row id for a symbol, assigning one (and growing the arrays) if new.
         """
-        return {
-            'symbol': symbol,
-            'start_time': start_time,
-            'end_time': start_time + timedelta(seconds=period_seconds),
-            'open': price,
-            'high': price,
-            'low': price,
-            'close': price,
-            'volume': qty,
-            'count': 1
-        }
+        sym_id = self._sym_id.get(symbol)
+        if sym_id is None:
+            sym_id = len(self._symbols)
+            if sym_id == self.bar_start.shape[0]:
+                self._allocate(2 * sym_id)
+            self._symbols.append(symbol)
+            self._sym_id[symbol] = sym_id
+        return sym_id
 
-    def _update_bar(self, bar: dict, price: float, qty: float):
+    def _finalize_bar(self, sym_id: int, tf_idx: int):
         """
-        Update an existing OHLCV bar with new tick data.
+        Finalize the active bar in slot (sym_id, tf_idx): log it and mark the slot empty.
         """
-        bar['high'] = max(bar['high'], price)
-        bar['low'] = min(bar['low'], price)
-        bar['close'] = price
-        bar['volume'] += qty
-        bar['count'] += 1
+        start_sec = int(self.bar_start[sym_id, tf_idx])
+        self.bar_start[sym_id, tf_idx] = -1
+        self._log_bar(
+            sym_id, tf_idx, start_sec,
+            self.bar_open[sym_id, tf_idx], self.bar_high[sym_id, tf_idx],
+            self.bar_low[sym_id, tf_idx], self.bar_close[sym_id, tf_idx],
+            self.bar_volume[sym_id, tf_idx]
+        )
 
-    def _finalize_bar(self, timeframe_sec: int, bar: dict):
+    def _log_bar(self, sym_id: int, tf_idx: int, start_sec: int,
+                 open_: float, high: float, low: float, close: float, volume: float):
         """
-        Log the finalized bar.
+        Log a finalized bar.
         Only emit bars with valid data (volume > 0).
         """
         # Discard empty bars or bars with invalid data
-        if bar['volume'] <= 0 or bar['close'] <= 0:
+        if volume <= 0 or close <= 0:
             return
 
-        tf_label = f"{timeframe_sec}S"
-        if timeframe_sec >= 60:
-            tf_label = f"{timeframe_sec // 60}M"
+        # Nothing below is needed if the record would be dropped
+        if not logger.isEnabledFor(logging.INFO):
+            return
+
+        # datetime is only materialized here, once per closed bar
+        start_time = datetime.fromtimestamp(start_sec, tz=timezone.utc)
 
-        log_msg = (
-            f"[{tf_label:<3}] [{bar['symbol']}] [{bar['start_time'].isoformat()}] "
-            f"O={bar['open']:.2f} H={bar['high']:.2f} L={bar['low']:.2f} "
-            f"C={bar['close']:.2f} V={bar['volume']:.3f}"
+        logger.info(
+            "[%s] [%s] [%s] O=%.2f H=%.2f L=%.2f C=%.2f V=%.3f",
+            self._tf_labels[tf_idx], self._symbols[sym_id], start_time.isoformat(),
+            open_, high, low, close, volume
         )
-        logger.info(log_msg)
 
-    def _check_buffer_closures(self):
+    def _check_buffer_closures(self, now: float):
         """
-        Check all active bars and finalize those that have passed their end_time.
+        Finalize all active bars that have passed their end time.
         This provides time-driven closure piggybacking on tick events.
+        
+        Only bars that are due are touched (heap pops), and sweeps are rate-limited
+        to one per SWEEP_INTERVAL; a bar still open when its next period starts is
+        finalized by the tick path instead.
         """
-        now = datetime.now(timezone.utc)
+        if now - self._last_sweep < SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
         
-        # Create a list of keys to allow modification of dictionary during iteration
-        for key in list(self.active_bars.keys()):
-            bar = self.active_bars[key]
-            timeframe_sec = key[1]
-            
-            # If current time exceeds the bar's end time, finalize it
-            if now > bar['end_time']:
-                self._finalize_bar(timeframe_sec, bar)
-                del self.active_bars[key]
+        closures = self._closures
+        bar_start = self.bar_start
+        # Ordered by end time, then symbol id, then timeframe
+        while closures and closures[0][0] < now:
+            _, sym_id, tf_idx, start_sec = heapq.heappop(closures)
+            if bar_start[sym_id, tf_idx] == start_sec:
+                self._finalize_bar(sym_id, tf_idx)
 
     def process_tick(self, tick: dict):
         """
         Process a normalized tick and update bars.
         
         Args:
-            tick (dict): Expects {'timestamp': ISO_str, 'symbol': str, 'price': float, 'quantity': float}
+            tick (dict): Expects {'timestamp': epoch_ms_int, 'symbol': str, 'price': float, 'quantity': float}
+        """
+        self.process_ticks((tick,) if tick else ())
+
+    def process_ticks(self, ticks):
         """
+        Process a batch of normalized ticks and update bars.
+        The closure sweep runs once per batch rather than once per tick.
+        
+        Args:
+            ticks (list): Normalized tick dicts, oldest first (same shape as process_tick)
+        """
+        # Raw epoch float: only compared against bar times, no datetime needed
+        now = time.time()
+        
         # Always run the time-driven closure check first
-        self._check_buffer_closures()
+        self._check_buffer_closures(now)
         
-        if not tick:
+        if not ticks:
             return
 
-        try:
-            # Parse timestamp explicitly to UTC datetime
-            ts = datetime.fromisoformat(tick['timestamp'])
-            price = tick['price']
-            qty = tick['quantity']
+        # Columnar view of the batch for the compiled kernel
+        known_id = self._sym_id.get
+        symbol_id = self._symbol_id
+        sym_ids = []
+        ts_sec = []
+        prices = []
+        qtys = []
+        # Ticks come from normalize(), which guarantees the fields and types:
+        # no per-tick exception handling here, errors surface to the caller
+        for tick in ticks:
             symbol = tick['symbol']
-            
-            now = datetime.now(timezone.utc)
-
-            for tf in self.timeframes:
-                key = (symbol, tf)
-                period_start = self._get_period_start(ts, tf)
-                period_end = period_start + timedelta(seconds=tf)
-
-                # Check if this tick belongs to a period that is already over in wall-clock time
-                # If the period end is in the past, it's a late tick that shouldn't re-open a bar
-                if period_end < now:
-                    continue
-
-                # Check if we have an active bar for this symbol & timeframe
-                if key in self.active_bars:
-                    current_bar = self.active_bars[key]
-                    
-                    if period_start == current_bar['start_time']:
-                        # Same period, update bar
-                        self._update_bar(current_bar, price, qty)
-                    else:
-                        # Since we ran _check_buffer_closures, stale bars should be gone.
-                        # If a bar exists but mismatch start_time, it might be a future bar? 
-                        # Or specific edge case. Safest to handle strict match.
-                        # If start time doesn't match, and we passed closure check, 
-                        # it means the existing bar is valid (future/current) but different? 
-                        # With strict wall clock, this implies we might have jumped periods?
-                        # In that case, we should finalize the old one (if valid) and start new.
-                        # But active_bars should only contain VALID current bars after check.
-                        
-                        # Just in case: finalize old, start new
-                        self._finalize_bar(tf, current_bar)
-                        self.active_bars[key] = self._create_bar(symbol, period_start, tf, price, qty)
-                        
-                else:
-                    # No active bar, start one
-                    self.active_bars[key] = self._create_bar(symbol, period_start, tf, price, qty)
-                    
-        except Exception as e:
-            logger.error(f"Error processing tick in Sampler: {e}")
+            # Known symbols resolve with one dict probe; the method only runs on first sight
+            sym_id = known_id(symbol)
+            if sym_id is None:
+                sym_id = symbol_id(symbol)
+            sym_ids.append(sym_id)
+            # Exchange time in epoch milliseconds -> whole seconds.
+            # Timeframes are whole seconds, so period alignment is exact integer math.
+            ts_sec.append(tick['timestamp'] // 1000)
+            prices.append(tick['price'])
+            qtys.append(tick['quantity'])
+
+        n = len(sym_ids)
+        if not n:
+            return
+
+        # At most one closed and one created bar per (tick, timeframe)
+        m = n * len(self.timeframes)
+        if self._created.shape[0] < m:
+            self._closed_slots = np.empty((m, 2), dtype=np.int64)
+            self._closed_vals = np.empty((m, 6))
+            self._created = np.empty((m, 3), dtype=np.int64)
+        closed_slots = self._closed_slots
+        closed_vals = self._closed_vals
+        created = self._created
+
+        # Arrays are read after symbol_id(): a new symbol may have grown them
+        n_closed, n_created = _update_bars(
+            self.bar_open, self.bar_high, self.bar_low, self.bar_close,
+            self.bar_volume, self.bar_count, self.bar_start, self._tf,
+            np.array(sym_ids, dtype=np.int64), np.array(ts_sec, dtype=np.int64),
+            np.array(prices), np.array(qtys), now,
+            closed_slots, closed_vals, created
+        )
+
+        # Bars closed because a tick of the next period arrived in this batch
+        for k in range(n_closed):
+            start_sec, open_, high, low, close, volume = closed_vals[k].tolist()
+            self._log_bar(int(closed_slots[k, 0]), int(closed_slots[k, 1]), int(start_sec),
+                          open_, high, low, close, volume)
+
+        # Schedule time-driven closure of the bars started in this batch
+        timeframes = self.timeframes
+        closures = self._closures
+        for sym_id, tf_idx, start_sec in created[:n_created].tolist():
+            heapq.heappush(closures, (start_sec + timeframes[tf_idx], sym_id, tf_idx, start_sec))
@@ -9,9 +9,9 @@ import numpy as np
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.analytics.hedge_ratio import compute_hedge_ratio
-from app.analytics.spread import compute_spread
+from app.analytics.spread import compute_spread, compute_zscore_of_spread
 from app.analytics.zscore import compute_zscore
-from app.analytics.correlation import compute_rolling_correlation
+from app.analytics.correlation import compute_rolling_correlation, compute_correlation
 from app.analytics.adf_test import run_adf_test
 
 def test_analytics():
@@ -42,6 +42,11 @@ def test_analytics():
     assert z[25] > 2, "Z-Score calculation failed"
     assert np.isnan(z[0]), "Z-Score should be NaN for first element"
 
+    # Fused spread Z-Score must match spread -> Z-Score
+    z_fused = compute_zscore_of_spread(x, y, beta, window=10)
+    z_ref = compute_zscore(compute_spread(x, y, beta), window=10)
+    assert np.allclose(z_fused, z_ref, equal_nan=True), "Fused spread Z-Score mismatch"
+
     # 4. Correlation
     x_corr = np.sin(np.linspace(0, 10, 100))
     y_corr = np.sin(np.linspace(0, 10, 100)) # Perfect correlation
@@ -49,6 +54,10 @@ def test_analytics():
     print(f"Correlation at end (Expected ~1.0): {corr[-1]:.4f}")
     assert corr[-1] > 0.99, "Correlation calculation failed"
 
+    # Scalar correlation of the last window must match the rolling value
+    assert abs(compute_correlation(x_corr[-20:], y_corr[-20:]) - corr[-1]) < 1e-9, "Scalar correlation mismatch"
+    assert compute_correlation(np.ones(20), y_corr[-20:]) is None, "Flat series should have no correlation"
+
     # 5. ADF Test
     # Mean reverting series (noise)
     stationary = np.random.normal(0, 1, 100)
@@ -64,9 +73,42 @@ def test_analytics():
 
     print("\nALL ANALYTICS TESTS PASSED ✅")
 
+def test_adf_matches_statsmodels():
+    from statsmodels.tsa.stattools import adfuller
+
+    # JIT kernel should reproduce statsmodels' autolag='AIC' result
+    series = np.cumsum(np.random.normal(0, 1, 50))
+    res = run_adf_test(series, force_autolag=True)
+    ref = adfuller(series, autolag='AIC')
+    assert abs(res['adf_statistic'] - ref[0]) < 1e-8, "ADF statistic mismatch"
+    assert abs(res['p_value'] - ref[1]) < 1e-8, "ADF p-value mismatch"
+
+def test_live_zscore_uses_btc_minus_eth_spread():
+    from app.ingestion import binance_ws
+    from app.api import routes
+
+    # Drive the live pipeline with one BTC + one ETH tick per batch
+    for buf in (binance_ws.btc_prices, binance_ws.eth_prices, binance_ws.spread_btc, binance_ws.spread_eth):
+        buf.clear()
+    rng = np.random.default_rng(0)
+    btc = 100_000 + np.cumsum(rng.normal(0, 50, 60))
+    eth = 4_000 + np.cumsum(rng.normal(0, 2, 60))
+    for i, (b, e) in enumerate(zip(btc, eth)):
+        binance_ws.process_ticks([("BTCUSDT", b, 1_700_000_000 + i), ("ETHUSDT", e, 1_700_000_000 + i)])
+
+    # Stored Z-Score must be the Z-Score of the recorded spread BTC - 25 * ETH
+    n = len(binance_ws.spread_btc)
+    spread = binance_ws.spread_btc.view() - 25.0 * binance_ws.spread_eth.view()
+    expected = compute_zscore(spread, window=n)[-1]
+    stored = routes.history_data.last()
+    assert abs(stored['spread'] - spread[-1]) < 1e-6, "Recorded spread mismatch"
+    assert abs(stored['z'] - expected) < 1e-9, "Live Z-Score computed on the wrong spread"
+
 if __name__ == "__main__":
     try:
         test_analytics()
+        test_adf_matches_statsmodels()
+        test_live_zscore_uses_btc_minus_eth_spread()
     except AssertionError as e:
         print(f"❌ Test Failed: {e}")
         sys.exit(1)